@@ -6,16 +6,474 @@ with ROE deduplication logic and anomaly detection.
 
 import pandas as pd
 import numpy as np
-from collections import defaultdict, Counter
+import xlsxwriter
+from joblib import Parallel, delayed
+from collections import defaultdict
 import re
 import sys
 import os
 
+# Input dtypes given up front instead of inferred (text stays text, e.g. unit "0012")
+INPUT_DTYPES = {
+    'Street Address': 'string',
+    'Unit Number': 'string',
+    'Subname': 'string',
+    'Building Type': 'category',
+}
+
+# Inputs above this many rows also get a Parquet copy of every output tab
+PARQUET_ROW_THRESHOLD = 100_000
+
+# ROE candidate count from which subnames are processed in a worker pool;
+# below it, pool startup (~1-2s) costs more than the serial run
+PARALLEL_ROW_THRESHOLD = 50_000
+
+# Excel sheet size limits (rows include the header row)
+EXCEL_MAX_ROWS = 1_048_576
+EXCEL_MAX_COLS = 16_384
+
+# Unit format classification as one anchored alternation: each named group is a
+# format label, and alternatives are tried in precedence order at position 0.
+# [\s\S]* rather than .* so a match spans line breaks (Alt+Enter cells), as the
+# substring checks did; a compiled DOTALL flag is rejected by the .str methods.
+UNIT_FORMAT_PATTERN = re.compile(
+    r'^(?:'
+    r'(?P<unit_format>UNIT)'               # e.g., "UNIT 6"
+    r'|(?P<apt_format>APT)'                # e.g., "APT 6"
+    r'|(?P<number_only>\d+$)'              # e.g., "6"
+    r'|(?P<ste_format>STE)'                # e.g., "STE 100" (commercial)
+    r'|(?P<building_format>[\s\S]*(?:BLDG|BUILDING))'  # e.g., "BLDG J"
+    r'|(?P<hash_b_format>#[\s\S]*B-)'      # e.g., "# B-1234"
+    r'|(?P<hash_format>#)'                 # e.g., "# 6"
+    r')'
+)
+
+# Format labels indexed by format code: the pattern's groups in order, then the
+# fallbacks for unmatched and missing units
+UNIT_FORMATS = np.array(list(UNIT_FORMAT_PATTERN.groupindex) + ['other_format', 'no_unit'], dtype=object)
+UNIT_FORMAT_CODES = {label: code for code, label in enumerate(UNIT_FORMATS)}
+STANDARD_FORMAT_CODES = np.array([UNIT_FORMAT_CODES[fmt] for fmt in ('unit_format', 'apt_format', 'number_only')])
+OTHER_FORMAT_CODE = UNIT_FORMAT_CODES['other_format']
+NO_UNIT_CODE = UNIT_FORMAT_CODES['no_unit']
+
+# Unit anomalies (dud, office and suite units), same structure as above
+UNIT_ANOMALY_PATTERN = re.compile(
+    r'^(?:'
+    r'(?P<u_indicator>(?:# )?U$)'
+    r'|(?P<office_indicator>[\s\S]*(?:OFC|OFFICE|CLUBHOUSE|LEASING|CLUB))'
+    r'|(?P<suite_indicator>[\s\S]*(?:STE|SUITE))'
+    r')'
+)
+
+
+def write_workbook(target, sheets):
+    """Write non-empty DataFrames to an Excel workbook, one sheet per entry.
+
+    `target` is a file path or a binary file-like object (e.g. BytesIO).
+    Rows are streamed to disk with xlsxwriter's constant_memory mode, so they
+    are written in row order here rather than via DataFrame.to_excel (which
+    writes column by column and would lose data in that mode).
+
+    Raises ValueError if a sheet exceeds Excel's size limits, before anything
+    is written (xlsxwriter itself silently drops out-of-range rows).
+    """
+    for sheet_name, df in sheets.items():
+        if df is not None and (len(df) + 1 > EXCEL_MAX_ROWS or len(df.columns) > EXCEL_MAX_COLS):
+            raise ValueError(
+                f"Sheet '{sheet_name}' is too large for Excel: {len(df) + 1} rows x {len(df.columns)} columns "
+                f"(max {EXCEL_MAX_ROWS} x {EXCEL_MAX_COLS})"
+            )
+
+    with xlsxwriter.Workbook(target, {
+        'constant_memory': True,
+        'strings_to_formulas': False,
+        'strings_to_urls': False,
+    }) as workbook:
+        header_format = workbook.add_format({'bold': True, 'border': 1, 'align': 'center', 'valign': 'top'})
+
+        for sheet_name, df in sheets.items():
+            if df is None or df.empty:
+                continue
+            worksheet = workbook.add_worksheet(sheet_name)
+            worksheet.write_row(0, 0, [str(col) for col in df.columns], header_format)
+
+            # Plain Python values with missing cells as None (written as blanks)
+            values = df.astype(object).where(df.notna(), None)
+            for row_num, row in enumerate(values.itertuples(index=False, name=None), start=1):
+                worksheet.write_row(row_num, 0, row)
+
+
+def normalize_units(units):
+    """Unit numbers as stripped, upper-cased strings (missing stays missing).
+
+    Computed once per subname and shared by unit_anomaly_mask and unit_format_codes.
+    """
+    return units.astype('string').str.strip().str.upper()
+
+
+def unit_anomaly_mask(unit_str):
+    """Vectorized AddressSorter.detect_unit_anomalies: True where a unit number is anomalous.
+
+    Expects normalize_units() output.
+    """
+    return unit_str.str.match(UNIT_ANOMALY_PATTERN, na=False).to_numpy(dtype=bool)
+
+
+def unit_format_codes(unit_str):
+    """Vectorized AddressSorter.get_unit_format_type, as int8 codes into UNIT_FORMATS.
+
+    Expects normalize_units() output.
+    """
+    # Unit strings repeat heavily within a community: classify each distinct value once
+    codes, distinct = pd.factorize(unit_str)
+
+    # One regex sweep; exactly one group matches per classified unit, and its
+    # column position is the format code
+    matched = pd.Series(distinct, dtype='string').str.extract(UNIT_FORMAT_PATTERN).notna().to_numpy()
+    distinct_codes = np.where(matched.any(axis=1), matched.argmax(axis=1), OTHER_FORMAT_CODE)
+
+    # Missing units have code -1, which picks the trailing no_unit code
+    lookup = np.append(distinct_codes, NO_UNIT_CODE).astype(np.int8)
+    return pd.Series(lookup[codes], index=unit_str.index)
+
+
+def _majority_format_code(format_counts, first_seen, candidates):
+    """Most frequent format code among `candidates`; ties go to the format seen first."""
+    best = np.lexsort((first_seen[candidates], -format_counts[candidates]))[0]
+    return candidates[best]
+
+
+def _integral_floats_as_ints(values):
+    """Float codes with only whole values (e.g. a numeric column with blanks) as Int64.
+
+    read_excel and pandas.read_csv give such columns as float64 where the Arrow
+    CSV reader gives int64; this makes every input path compare them the same way.
+    """
+    if pd.api.types.is_float_dtype(values):
+        floats = values.to_numpy(dtype='float64', na_value=np.nan)
+        present = ~np.isnan(floats)
+        if np.array_equal(floats[present], np.trunc(floats[present])):
+            return values.astype('Int64')
+    return values
+
+
+def plus4_anomaly_mask(plus4, zip_codes=None):
+    """True where a Plus 4 Code is 5 digits (should be 4) or equals the Zip.
+
+    Integer-typed codes (the usual case for Arrow-parsed CSVs, and whole-number
+    float columns from the other readers) are checked with integer comparisons
+    on numpy arrays; anything else is compared as stripped strings. Missing
+    Plus 4 Codes are never anomalies here.
+    """
+    plus4 = _integral_floats_as_ints(plus4)
+    if zip_codes is not None:
+        zip_codes = _integral_floats_as_ints(zip_codes)
+    present = plus4.notna().to_numpy()
+    zip_is_int = zip_codes is None or pd.api.types.is_integer_dtype(zip_codes)
+
+    if pd.api.types.is_integer_dtype(plus4) and zip_is_int:
+        values = plus4.to_numpy(dtype='int64', na_value=-1)
+        is_five_digits = (values >= 10000) & (values <= 99999)
+        if zip_codes is None:
+            return present & is_five_digits
+        equals_zip = zip_codes.notna().to_numpy() & (values == zip_codes.to_numpy(dtype='int64', na_value=-1))
+        return present & (is_five_digits | equals_zip)
+
+    plus4_str = plus4.astype('string').str.strip()
+    lengths = plus4_str.str.len().to_numpy(dtype='int64', na_value=0)
+    is_digits = plus4_str.str.isdigit().to_numpy(dtype=bool, na_value=False)
+    # A missing Zip compares as '' (matches a blank Plus 4 Code)
+    if zip_codes is None:
+        zip_str = np.full(len(plus4), '', dtype=object)
+    else:
+        zip_str = zip_codes.astype('string').str.strip().fillna('').to_numpy(dtype=object)
+    equals_zip = plus4_str.fillna('').to_numpy(dtype=object) == zip_str
+    return present & (((lengths == 5) & is_digits) | equals_zip)
+
+
+def _flag_rows(rows, reason):
+    """Build Flagged for Review entries (index, reason, row data) for a slice of rows.
+
+    `reason` is either one string for every row or one string per row.
+    """
+    flagged = rows.assign(index=rows.index, reason=reason)
+    return flagged[['index', 'reason'] + list(rows.columns)]
+
+
+def _street_unit_counts(street_codes, n_streets, has_unit):
+    """Per-street address counts and with-unit counts from factorized street codes.
+
+    Rows with code -1 (no Street Address) are not counted.
+    """
+    in_street = street_codes >= 0
+    street_size = np.bincount(street_codes[in_street], minlength=n_streets)
+    street_with_unit = np.bincount(street_codes[in_street & has_unit], minlength=n_streets)
+    return street_size, street_with_unit
+
+
+def _street_dedupe_masks(street_codes, street_size, street_with_unit, has_unit,
+                         prefer_with_unit, drop_isolated_no_unit):
+    """Row-level keep/remove masks for one subname's street duplicates.
+
+    On streets listed both with and without a unit number, only the preferred
+    version is kept and the other is removed; single-version streets are kept,
+    unless drop_isolated_no_unit removes streets that have no with-unit rows.
+    Rows with code -1 (no Street Address) are neither kept nor removed.
+    """
+    in_street = street_codes >= 0
+
+    # Per-row lookups; the appended 0 is what code -1 picks up
+    street_has_unit = np.append(street_with_unit, 0)[street_codes] > 0
+    street_has_no_unit = np.append(street_size - street_with_unit, 0)[street_codes] > 0
+    mixed_street = street_has_unit & street_has_no_unit
+
+    keep_mask = in_street & (~mixed_street | (has_unit == prefer_with_unit))
+    remove_mask = in_street & mixed_street & (has_unit != prefer_with_unit)
+
+    if drop_isolated_no_unit:
+        isolated_no_unit = in_street & ~street_has_unit
+        keep_mask &= ~isolated_no_unit
+        remove_mask |= isolated_no_unit
+
+    return keep_mask, remove_mask
+
+
+def process_roe_subname(subname_df, subname, building_type):
+    """Process a single subname group for ROE logic.
+
+    Pure function of its arguments so groups can run in worker processes.
+    Returns (keep indices, remove indices, flagged DataFrames, notes), where
+    notes are log messages for the caller to print.
+    """
+    # Sets give O(1) membership/discard; materialized as sorted lists on return
+    keep_addresses = set()
+    remove_addresses = set()
+    flagged = []
+    notes = []
+
+    # Exclusion phase: unit anomalies, Plus 4 anomalies and empty Plus 4 codes
+    # all go to Remove. Collect them in one mask and slice the frame once.
+
+    # Upper-cased unit strings, shared by every unit check below
+    unit_str = normalize_units(subname_df['Unit Number'])
+
+    # Check for unit anomalies first (OFC, OFFICE, STE, etc.)
+    # (they go straight to Remove, not flagged)
+    excluded = unit_anomaly_mask(unit_str)
+
+    # Check for 5-digit Plus 4 Code in ROE addresses (dud addresses like backyards)
+    # Apply to HOA, MDU, and SFA building types
+    roe_types = ['HOA', 'Residential - MDU', 'SFA']
+    if building_type in roe_types and 'Plus 4 Code' in subname_df.columns:
+        # Check if Plus 4 Code is 5 digits (should be 4) or equals Zip
+        zip_codes = subname_df['Zip'] if 'Zip' in subname_df.columns else None
+        excluded |= plus4_anomaly_mask(subname_df['Plus 4 Code'], zip_codes)
+
+    # Check for empty Plus 4 Code (skip "Other" building type as those are pre-flagged)
+    if 'Plus 4 Code' in subname_df.columns and building_type != 'Other':
+        empty_plus4_mask = subname_df['Plus 4 Code'].isna().to_numpy() & ~excluded
+        if empty_plus4_mask.any():
+            # Flag for review AND remove
+            flagged.append(_flag_rows(
+                subname_df[empty_plus4_mask],
+                'Empty Plus 4 Code - verify if valid address'
+            ))
+        excluded |= empty_plus4_mask
+
+    remove_addresses.update(subname_df.index[excluded])
+    subname_df = subname_df[~excluded]
+
+    if len(subname_df) == 0:
+        return sorted(keep_addresses), sorted(remove_addresses), flagged, notes
+
+    # Check for oversized communities (>800 addresses)
+    if len(subname_df) > 800:
+        flagged.append(_flag_rows(
+            subname_df,
+            f'Community has {len(subname_df)} addresses (>800 threshold)'
+        ))
+
+    # DIFFERENT LOGIC FOR MDU vs SFA/HOA
+    is_mdu = building_type == 'Residential - MDU'
+
+    # Integer arrays for the rest of the scan: unit presence and street codes
+    # (rows without a Street Address get code -1 and belong to no street)
+    has_unit = subname_df['Unit Number'].notna().to_numpy()
+    street_codes, streets = pd.factorize(subname_df['Street Address'])
+
+    # SPECIAL CASE: Check if this is a "condo-style" SFA/HOA
+    # (all addresses share the same street address with different units)
+    unique_streets = len(streets)
+    total_addresses = len(subname_df)
+    with_units = int(has_unit.sum())
+
+    # If 80%+ addresses share the same street AND have units, treat like MDU
+    is_condo_style = (unique_streets <= 3 and
+                     with_units / total_addresses > 0.8 and
+                     total_addresses > 50)
+
+    if is_condo_style and not is_mdu:
+        notes.append(f"Detected condo-style {building_type} (treating like MDU)")
+
+    # FOR MDU: Check for mixed unit formats BEFORE deduplication
+    # Analyze unit format consistency within subname
+    # Formats are int8 codes into UNIT_FORMATS; labels are looked up only for flagged rows
+    format_codes = unit_format_codes(unit_str[~excluded])
+    format_counts = np.bincount(format_codes, minlength=len(UNIT_FORMATS))
+    has_mixed_formats = np.count_nonzero(format_counts) > 1
+
+    # Row position where each format first appears, to break count ties
+    seen_codes, first_positions = np.unique(format_codes, return_index=True)
+    first_seen = np.full(len(UNIT_FORMATS), len(format_codes))
+    first_seen[seen_codes] = first_positions
+
+    # Track which rows have non-majority formats (for MDU only)
+    non_majority_mask = np.zeros(len(subname_df), dtype=bool)
+    if is_mdu and has_mixed_formats:
+        # Count standard formats only (exclude no_unit)
+        standard_format_counts = format_counts[STANDARD_FORMAT_CODES]
+
+        # If we have standard formats, find the most common one
+        if standard_format_counts.any():
+            majority_code = _majority_format_code(format_counts, first_seen, STANDARD_FORMAT_CODES)
+            majority_standard_format = UNIT_FORMATS[majority_code]
+
+            # Flag ALL addresses that don't match the majority standard format
+            # This includes both anomalous formats AND minority standard formats
+            codes = format_codes.to_numpy()
+            non_majority_mask = (codes != majority_code) & (codes != NO_UNIT_CODE)
+            non_majority_formats = UNIT_FORMATS[codes[non_majority_mask]]
+
+            if non_majority_mask.any():
+                # Determine if it's anomalous or just minority standard
+                non_majority_reasons = np.where(
+                    ~np.isin(codes[non_majority_mask], STANDARD_FORMAT_CODES),
+                    'MDU anomalous format: ' + non_majority_formats + f' (standard is {majority_standard_format})',
+                    'MDU minority format: ' + non_majority_formats + f' (majority is {majority_standard_format})',
+                )
+                flagged.append(_flag_rows(
+                    subname_df[non_majority_mask], non_majority_reasons
+                ))
+
+    # Remove non-majority format addresses from consideration in deduplication
+    subname_df = subname_df[~non_majority_mask]
+    has_unit = has_unit[~non_majority_mask]
+    street_codes = street_codes[~non_majority_mask]
+
+    if len(subname_df) == 0:
+        return sorted(keep_addresses), sorted(remove_addresses), flagged, notes
+
+    street_size, street_with_unit = _street_unit_counts(street_codes, len(streets), has_unit)
+
+    # Detect townhome-style: each physical address exists as both a no-unit and with-unit duplicate
+    # Calculate ratio of unique street addresses to total addresses
+    unique_street_count = int((street_size > 0).sum())
+    total_addresses_in_subname = len(subname_df)
+    unique_street_ratio = unique_street_count / total_addresses_in_subname if total_addresses_in_subname > 0 else 0
+
+    # For MDU/condo: if >85% of addresses have unique street numbers, it's townhome-style
+    is_townhome_style = (is_mdu or is_condo_style) and unique_street_ratio > 0.85
+
+    # For SFA/HOA: detect townhome-style by checking if most duplicate pairs are
+    # exactly one no-unit + one with-unit (the classic "address listed twice" pattern)
+    if not is_townhome_style and not is_mdu and not is_condo_style:
+        total_dupe_groups = int((street_size > 1).sum())
+        paired_dupe_count = int(((street_size == 2) & (street_with_unit == 1)).sum())
+        # If 70%+ of duplicate groups are clean pairs, treat as townhome-style
+        if total_dupe_groups > 0 and paired_dupe_count / total_dupe_groups >= 0.70:
+            is_townhome_style = True
+            notes.append(f"Detected townhome-style SFA ({paired_dupe_count}/{total_dupe_groups} duplicate pairs are clean no-unit/with-unit pairs)")
+
+    if is_townhome_style and (is_mdu or is_condo_style):
+        notes.append(f"Detected townhome-style MDU (unique street ratio: {unique_street_ratio:.2f})")
+
+    # For mixed streets, decide which version to keep; single-version streets are kept
+    if is_townhome_style:
+        # TOWNHOME-STYLE MDU: Each townhome has unique street number
+        # Prefer no-unit versions (correct address), remove with-unit (duplicates)
+        prefer_with_unit = False
+    elif is_mdu or is_condo_style:
+        # APARTMENT-STYLE MDU: Multiple units share same building address
+        # Keep with-unit versions (actual apartments/condos), remove no-unit (likely leasing office/clubhouse)
+        prefer_with_unit = True
+    else:
+        # SFA/HOA LOGIC: Keep the majority (with-unit or no-unit) community-wide
+        with_unit_in_community = int(has_unit.sum())
+        no_unit_in_community = len(subname_df) - with_unit_in_community
+        prefer_with_unit = with_unit_in_community > no_unit_in_community
+
+    # APARTMENT-STYLE streets with only no-unit versions: if 80%+ of community
+    # has units, remove these isolated no-unit addresses (likely offices).
+    # Otherwise keep them (might be valid addresses like Montelena)
+    drop_isolated_no_unit = (is_mdu or is_condo_style) and not is_townhome_style and has_unit.mean() >= 0.8
+
+    keep_mask, remove_mask = _street_dedupe_masks(
+        street_codes, street_size, street_with_unit, has_unit,
+        prefer_with_unit, drop_isolated_no_unit
+    )
+
+    keep_addresses.update(subname_df.index[keep_mask])
+    remove_addresses.update(subname_df.index[remove_mask])
+
+    # For non-MDU: Check if there's a clear majority format and minority formats
+    # (MDU format checking already happened earlier)
+    if not is_mdu and has_mixed_formats:
+        total = len(format_codes)
+        majority_code = _majority_format_code(format_counts, first_seen, np.arange(len(UNIT_FORMATS)))
+        majority_format = UNIT_FORMATS[majority_code]
+        majority_count = format_counts[majority_code]
+
+        # If majority is > 80%, flag minority formats
+        if majority_count / total > 0.8:
+            # Reuse the formats classified above for rows still undecided
+            undecided = ~subname_df.index.isin(list(keep_addresses | remove_addresses))
+            row_codes = format_codes.loc[subname_df.index[undecided]]
+            minority_codes = row_codes[(row_codes != majority_code) & (row_codes != NO_UNIT_CODE)]
+
+            if len(minority_codes) > 0:
+                flagged.append(_flag_rows(
+                    subname_df.loc[minority_codes.index],
+                    'Minority unit format (' + UNIT_FORMATS[minority_codes.to_numpy()] + f') vs majority ({majority_format})'
+                ))
+
+    # Check for one-off scenarios
+    total_in_subname = len(subname_df)
+    with_unit_count = int(has_unit.sum())
+    no_unit_count = total_in_subname - with_unit_count
+
+    # Scenario: 149 with units, 1 without (or vice versa)
+    if total_in_subname > 10:  # Only flag if substantial sample size
+        if no_unit_count == 1 and with_unit_count > 10:
+            # The single no-unit is likely office/clubhouse
+            single_idx = subname_df.index[~has_unit][0]
+            keep_addresses.discard(single_idx)
+            remove_addresses.add(single_idx)
+            flagged.append(_flag_rows(
+                subname_df.loc[[single_idx]],
+                f'One-off: Single address without unit among {with_unit_count} with units'
+            ))
+        elif with_unit_count == 1 and no_unit_count > 10:
+            # The single with-unit is likely office
+            single_idx = subname_df.index[has_unit][0]
+            keep_addresses.discard(single_idx)
+            remove_addresses.add(single_idx)
+            flagged.append(_flag_rows(
+                subname_df.loc[[single_idx]],
+                f'One-off: Single address with unit among {no_unit_count} without units'
+            ))
+
+    return sorted(keep_addresses), sorted(remove_addresses), flagged, notes
+
 
 class AddressSorter:
-    def __init__(self, input_file):
-        """Initialize the address sorter with input file."""
+    def __init__(self, input_file, n_jobs=-1):
+        """Initialize the address sorter with input file.
+
+        n_jobs: worker processes for per-subname ROE processing (-1 = all cores, 1 = serial).
+            Inputs under PARALLEL_ROW_THRESHOLD ROE candidates always run serially.
+        """
         self.input_file = input_file
+        self.n_jobs = n_jobs
         self.df = None
         self.tabs = {
             'All': None,
@@ -29,16 +487,24 @@ class AddressSorter:
             'Unit Count': None
         }
         self.new_market_tabs = {}  # Keyed by tab name, e.g. "New Market IRV-Z2"
-        self.flagged_addresses = []
+        self.flagged_addresses = []  # DataFrame slices, concatenated in create_flagged_tab
         self.required_columns = ['ID', 'Street Address', 'Unit Number', 'Building Type', 'Subname']
+        self.optional_columns = ['City', 'Zip', 'Plus 4 Code', 'Zone', 'Street Name']
 
     def load_data(self):
         """Load the input CSV file."""
         print(f"Loading data from {self.input_file}...")
+        wanted_cols = self.required_columns + self.optional_columns
         if self.input_file.endswith('.csv'):
-            self.df = pd.read_csv(self.input_file, low_memory=False)
+            # Read the header only, then parse just the columns we keep
+            header = pd.read_csv(self.input_file, nrows=0).columns
+            self.df = self._read_csv_columns([col for col in wanted_cols if col in header])
         elif self.input_file.endswith('.xlsx'):
-            self.df = pd.read_excel(self.input_file)
+            self.df = pd.read_excel(
+                self.input_file,
+                usecols=lambda col: col in wanted_cols,
+                dtype=INPUT_DTYPES,
+            )
         else:
             raise ValueError("Input file must be CSV or Excel (.xlsx)")
 
@@ -49,8 +515,7 @@ class AddressSorter:
 
         # Keep only essential columns (plus a few useful ones)
         essential_cols = self.required_columns.copy()
-        optional_cols = ['City', 'Zip', 'Plus 4 Code', 'Zone', 'Street Name']
-        for col in optional_cols:
+        for col in self.optional_columns:
             if col in self.df.columns:
                 essential_cols.append(col)
 
@@ -60,31 +525,67 @@ class AddressSorter:
         self.df['Subname'] = self.df['Subname'].fillna('No Subname')
         self.df['Subname'] = self.df['Subname'].replace('', 'No Subname')
 
+        # Low-cardinality grouping columns: categorical codes make groupby/isin cheap
+        for col in ('Subname', 'Building Type'):
+            self.df[col] = self.df[col].astype('category')
+
         print(f"Loaded {len(self.df)} addresses")
         print(f"Building types found: {self.df['Building Type'].value_counts().to_dict()}")
 
+    def _read_csv_columns(self, columns):
+        """Read only `columns` from the input CSV.
+
+        Uses pyarrow's multithreaded CSV parser when available, projecting the
+        columns at parse time and keeping Arrow-backed dtypes. Falls back to
+        pandas otherwise.
+        """
+        dtypes = {col: dtype for col, dtype in INPUT_DTYPES.items() if col in columns}
+        try:
+            # Lazy import so pandas-only environments still work
+            import pyarrow as pa
+            from pyarrow import csv as pa_csv
+        except ImportError:
+            return pd.read_csv(self.input_file, usecols=columns, dtype=dtypes, low_memory=False)
+
+        table = pa_csv.read_csv(
+            self.input_file,
+            # Quoted cells may hold line breaks (Alt+Enter units); without this the
+            # parallel reader can split a block inside such a cell
+            parse_options=pa_csv.ParseOptions(newlines_in_values=True),
+            convert_options=pa_csv.ConvertOptions(
+                include_columns=columns,
+                # Text columns stay strings; categoricals are built in load_data
+                column_types={col: pa.string() for col in dtypes},
+                strings_can_be_null=True,
+            ),
+        )
+        return table.to_pandas(types_mapper=pd.ArrowDtype)
+
     def initial_sort(self):
         """Perform initial sorting into basic categories."""
         print("\nPerforming initial sort by building type...")
 
+        # Tabs are never modified in place, so no defensive copies: boolean
+        # indexing already returns new frames, and All shares self.df.
+
         # All tab gets everything
-        self.tabs['All'] = self.df.copy()
+        self.tabs['All'] = self.df
 
         # Public = Residential only (not MDU, not SFA, not HOA, not Mobile)
-        self.tabs['Public'] = self.df[self.df['Building Type'] == 'Residential'].copy()
+        self.tabs['Public'] = self.df[self.df['Building Type'] == 'Residential']
 
         # Commercial
-        self.tabs['Commercial'] = self.df[self.df['Building Type'] == 'Commercial'].copy()
+        self.tabs['Commercial'] = self.df[self.df['Building Type'] == 'Commercial']
 
         # Competitive
-        self.tabs['Competitive'] = self.df[self.df['Building Type'] == 'Competitive'].copy()
+        self.tabs['Competitive'] = self.df[self.df['Building Type'] == 'Competitive']
 
         # Other
-        self.tabs['Other'] = self.df[self.df['Building Type'] == 'Other'].copy()
+        self.tabs['Other'] = self.df[self.df['Building Type'] == 'Other']
 
         # ROE candidates (before deduplication)
         roe_types = ['Residential - MDU', 'SFA', 'HOA', 'Mobile']
-        roe_candidates = self.df[self.df['Building Type'].isin(roe_types)].copy()
+        roe_candidates = self.df[self.df['Building Type'].isin(roe_types)]
 
         print(f"  Public: {len(self.tabs['Public'])} addresses")
         print(f"  Commercial: {len(self.tabs['Commercial'])} addresses")
@@ -101,19 +602,9 @@ class AddressSorter:
 
         unit_str = str(unit_value).upper().strip()
 
-        # Check for standalone "U" or "# U" (dud addresses)
-        if unit_str == 'U' or unit_str == '# U':
-            return 'u_indicator'
-
-        # Check for office/commercial indicators
-        if any(keyword in unit_str for keyword in ['OFC', 'OFFICE', 'CLUBHOUSE', 'LEASING', 'CLUB']):
-            return 'office_indicator'
-
-        # Check for suite (commercial)
-        if 'STE' in unit_str or 'SUITE' in unit_str:
-            return 'suite_indicator'
-
-        return None
+        # "U" / "# U" (dud addresses), office/commercial indicators, suites
+        match = UNIT_ANOMALY_PATTERN.match(unit_str)
+        return match.lastgroup if match else None
 
     def normalize_unit_format(self, unit_value):
         """Normalize unit format for comparison."""
@@ -136,331 +627,16 @@ class AddressSorter:
 
         unit_str = str(unit_value).strip().upper()
 
-        # Standard formats
-        if unit_str.startswith('UNIT'):
-            return 'unit_format'  # e.g., "UNIT 6"
-        elif unit_str.startswith('APT'):
-            return 'apt_format'   # e.g., "APT 6"
-        elif re.match(r'^\d+$', unit_str):
-            return 'number_only'  # e.g., "6"
-
-        # Anomalous formats that should be flagged
-        elif unit_str.startswith('STE'):
-            return 'ste_format'   # e.g., "STE 100" (commercial)
-        elif 'BLDG' in unit_str or 'BUILDING' in unit_str:
-            return 'building_format'  # e.g., "BLDG J"
-        elif unit_str.startswith('#') and 'B-' in unit_str:
-            return 'hash_b_format'  # e.g., "# B-1234"
-        elif unit_str.startswith('#'):
-            return 'hash_format'  # e.g., "# 6"
-        else:
-            return 'other_format'
+        # Standard formats (unit/apt/number only) or anomalous formats to flag
+        match = UNIT_FORMAT_PATTERN.match(unit_str)
+        return match.lastgroup if match else 'other_format'
 
     def process_roe_subname(self, subname_df, subname, building_type):
         """Process a single subname group for ROE logic."""
-        keep_addresses = []
-        remove_addresses = []
-        flagged = []
-
-        # Check for unit anomalies first (OFC, OFFICE, STE, etc.)
-        anomaly_indices = []
-        for idx, row in subname_df.iterrows():
-            anomaly = self.detect_unit_anomalies(row['Unit Number'])
-            if anomaly:
-                anomaly_indices.append(idx)
-                continue
-
-        # Remove anomalies from consideration (they go straight to Remove, not flagged)
-        subname_df = subname_df.drop(anomaly_indices)
-        remove_addresses.extend(anomaly_indices)  # Add to remove list
-
-        if len(subname_df) == 0:
-            return keep_addresses, remove_addresses, flagged
-
-        # Check for 5-digit Plus 4 Code in ROE addresses (dud addresses like backyards)
-        # Apply to HOA, MDU, and SFA building types
-        plus4_anomaly_indices = []
-        roe_types = ['HOA', 'Residential - MDU', 'SFA']
-        if building_type in roe_types and 'Plus 4 Code' in subname_df.columns:
-            for idx, row in subname_df.iterrows():
-                plus4 = row['Plus 4 Code']
-                zip_code = row.get('Zip', None)
-                if pd.notna(plus4):
-                    plus4_str = str(plus4).strip()
-                    zip_str = str(zip_code).strip() if pd.notna(zip_code) else ''
-                    # Check if Plus 4 Code is 5 digits (should be 4) or equals Zip
-                    if (len(plus4_str) == 5 and plus4_str.isdigit()) or (plus4_str == zip_str):
-                        plus4_anomaly_indices.append(idx)
-
-        # Remove Plus 4 Code anomalies
-        subname_df = subname_df.drop(plus4_anomaly_indices)
-        remove_addresses.extend(plus4_anomaly_indices)
-
-        if len(subname_df) == 0:
-            return keep_addresses, remove_addresses, flagged
-
-        # Check for empty Plus 4 Code (skip "Other" building type as those are pre-flagged)
-        empty_plus4_indices = []
-        if 'Plus 4 Code' in subname_df.columns and building_type != 'Other':
-            for idx, row in subname_df.iterrows():
-                plus4 = row.get('Plus 4 Code', None)
-                if pd.isna(plus4):
-                    empty_plus4_indices.append(idx)
-                    # Flag for review AND remove
-                    flagged.append({
-                        'index': idx,
-                        'reason': 'Empty Plus 4 Code - verify if valid address',
-                        **row.to_dict()
-                    })
-
-        # Remove empty Plus 4 Code addresses
-        subname_df = subname_df.drop(empty_plus4_indices)
-        remove_addresses.extend(empty_plus4_indices)
-
-        if len(subname_df) == 0:
-            return keep_addresses, remove_addresses, flagged
-
-        # Check for oversized communities (>800 addresses)
-        if len(subname_df) > 800:
-            for idx, row in subname_df.iterrows():
-                flagged.append({
-                    'index': idx,
-                    'reason': f'Community has {len(subname_df)} addresses (>800 threshold)',
-                    **row.to_dict()
-                })
-
-        # DIFFERENT LOGIC FOR MDU vs SFA/HOA
-        is_mdu = building_type == 'Residential - MDU'
-
-        # SPECIAL CASE: Check if this is a "condo-style" SFA/HOA
-        # (all addresses share the same street address with different units)
-        unique_streets = subname_df['Street Address'].nunique()
-        total_addresses = len(subname_df)
-        with_units = len(subname_df[~subname_df['Unit Number'].isna()])
-
-        # If 80%+ addresses share the same street AND have units, treat like MDU
-        is_condo_style = (unique_streets <= 3 and
-                         with_units / total_addresses > 0.8 and
-                         total_addresses > 50)
-
-        if is_condo_style and not is_mdu:
-            print(f"    Note: Detected condo-style {building_type} (treating like MDU)")
-
-        # FOR MDU: Check for mixed unit formats BEFORE deduplication
-        # Analyze unit format consistency within subname
-        all_formats = subname_df['Unit Number'].apply(self.get_unit_format_type)
-        format_counts = Counter(all_formats)
-
-        # Define standard vs anomalous formats
-        standard_formats = {'unit_format', 'apt_format', 'number_only'}
-        anomalous_formats = {'ste_format', 'building_format', 'hash_b_format', 'hash_format', 'other_format'}
-
-        # Track which indices have non-majority formats (for MDU only)
-        non_majority_format_indices = []
-        if is_mdu and len(format_counts) > 1:
-            # Count standard formats only (exclude no_unit)
-            standard_format_counts = {fmt: count for fmt, count in format_counts.items()
-                                     if fmt in standard_formats}
-
-            # If we have standard formats, find the most common one
-            if standard_format_counts:
-                majority_standard_format = max(standard_format_counts, key=standard_format_counts.get)
-
-                # Flag ALL addresses that don't match the majority standard format
-                # This includes both anomalous formats AND minority standard formats
-                for idx, row in subname_df.iterrows():
-                    row_format = self.get_unit_format_type(row['Unit Number'])
-                    if row_format != majority_standard_format and row_format != 'no_unit':
-                        non_majority_format_indices.append(idx)
-
-                        # Determine if it's anomalous or just minority standard
-                        if row_format in anomalous_formats:
-                            reason = f'MDU anomalous format: {row_format} (standard is {majority_standard_format})'
-                        else:
-                            reason = f'MDU minority format: {row_format} (majority is {majority_standard_format})'
-
-                        flagged.append({
-                            'index': idx,
-                            'reason': reason,
-                            **row.to_dict()
-                        })
-
-        # Remove non-majority format addresses from consideration in deduplication
-        subname_df = subname_df.drop(non_majority_format_indices)
-
-        if len(subname_df) == 0:
-            return keep_addresses, remove_addresses, flagged
-
-        # Detect townhome-style: each physical address exists as both a no-unit and with-unit duplicate
-        # Calculate ratio of unique street addresses to total addresses
-        unique_street_count = subname_df['Street Address'].nunique()
-        total_addresses_in_subname = len(subname_df)
-        unique_street_ratio = unique_street_count / total_addresses_in_subname if total_addresses_in_subname > 0 else 0
-
-        # For MDU/condo: if >85% of addresses have unique street numbers, it's townhome-style
-        is_townhome_style = (is_mdu or is_condo_style) and unique_street_ratio > 0.85
-
-        # For SFA/HOA: detect townhome-style by checking if most duplicate pairs are
-        # exactly one no-unit + one with-unit (the classic "address listed twice" pattern)
-        if not is_townhome_style and not is_mdu and not is_condo_style:
-            paired_dupe_count = 0
-            total_dupe_groups = 0
-            for street_address, group in subname_df.groupby('Street Address'):
-                if len(group) > 1:
-                    total_dupe_groups += 1
-                    no_unit_in_group = group['Unit Number'].isna().sum()
-                    with_unit_in_group = group['Unit Number'].notna().sum()
-                    if no_unit_in_group == 1 and with_unit_in_group == 1:
-                        paired_dupe_count += 1
-            # If 70%+ of duplicate groups are clean pairs, treat as townhome-style
-            if total_dupe_groups > 0 and paired_dupe_count / total_dupe_groups >= 0.70:
-                is_townhome_style = True
-                print(f"    Note: Detected townhome-style SFA ({paired_dupe_count}/{total_dupe_groups} duplicate pairs are clean no-unit/with-unit pairs)")
-
-        if is_townhome_style and (is_mdu or is_condo_style):
-            print(f"    Note: Detected townhome-style MDU (unique street ratio: {unique_street_ratio:.2f})")
-
-        # Group by street address to find duplicates
-        address_groups = subname_df.groupby('Street Address')
-
-        for street_address, group in address_groups:
-            group_indices = group.index.tolist()
-
-            # Separate those with unit numbers and those without
-            no_unit = group[group['Unit Number'].isna()]
-            with_unit = group[~group['Unit Number'].isna()]
-
-            no_unit_indices = no_unit.index.tolist()
-            with_unit_indices = with_unit.index.tolist()
-
-            if is_townhome_style:
-                # TOWNHOME-STYLE MDU: Each townhome has unique street number
-                # Prefer no-unit versions (correct address), remove with-unit (duplicates)
-                if len(no_unit_indices) > 0 and len(with_unit_indices) > 0:
-                    # Keep no-unit versions (actual townhome addresses)
-                    keep_addresses.extend(no_unit_indices)
-                    # Remove with-unit versions (duplicates with incorrect units)
-                    remove_addresses.extend(with_unit_indices)
-
-                # If only no-unit versions exist
-                elif len(no_unit_indices) > 0 and len(with_unit_indices) == 0:
-                    keep_addresses.extend(no_unit_indices)
-
-                # If only with-unit versions exist (unusual but possible)
-                elif len(with_unit_indices) > 0 and len(no_unit_indices) == 0:
-                    # Keep them since no alternative exists
-                    keep_addresses.extend(with_unit_indices)
-
-            elif is_mdu or is_condo_style:
-                # APARTMENT-STYLE MDU: Multiple units share same building address
-                # Each unit is a separate customer
-                # If we have both versions (with and without unit)
-                if len(no_unit_indices) > 0 and len(with_unit_indices) > 0:
-                    # Keep all with-unit versions (actual apartments/condos)
-                    keep_addresses.extend(with_unit_indices)
-                    # Remove no-unit versions (likely leasing office/clubhouse)
-                    remove_addresses.extend(no_unit_indices)
-
-                # If only with-unit versions exist
-                elif len(with_unit_indices) > 0 and len(no_unit_indices) == 0:
-                    # Keep all unit versions
-                    keep_addresses.extend(with_unit_indices)
-
-                # If only no-unit versions exist
-                elif len(no_unit_indices) > 0 and len(with_unit_indices) == 0:
-                    # Check if this is an isolated no-unit in a mostly with-unit community
-                    # Calculate percentage of addresses with units in the whole subname
-                    total_with_units = len(subname_df[~subname_df['Unit Number'].isna()])
-                    total_in_subname = len(subname_df)
-                    percent_with_units = total_with_units / total_in_subname if total_in_subname > 0 else 0
-
-                    # If 80%+ of community has units, remove isolated no-unit addresses (likely offices)
-                    if percent_with_units >= 0.8:
-                        remove_addresses.extend(no_unit_indices)
-                    else:
-                        # Otherwise keep them (might be valid addresses like Montelena)
-                        keep_addresses.extend(no_unit_indices)
-
-            else:
-                # SFA/HOA LOGIC: Keep the majority (with-unit or no-unit) community-wide
-                # Determine community-wide majority
-                total_in_community = len(subname_df)
-                with_unit_in_community = len(subname_df[~subname_df['Unit Number'].isna()])
-                no_unit_in_community = total_in_community - with_unit_in_community
-                
-                # Community-wide majority determines what to keep
-                community_prefers_with_unit = with_unit_in_community > no_unit_in_community
-                
-                # If we have both versions (with and without unit) at same street address
-                if len(no_unit_indices) > 0 and len(with_unit_indices) > 0:
-                    if community_prefers_with_unit:
-                        # Community majority have units: keep with-unit, remove no-unit
-                        keep_addresses.extend(with_unit_indices)
-                        remove_addresses.extend(no_unit_indices)
-                    else:
-                        # Community majority don't have units: keep no-unit, remove with-unit
-                        keep_addresses.extend(no_unit_indices)
-                        remove_addresses.extend(with_unit_indices)
-
-                # If only no-unit versions exist
-                elif len(no_unit_indices) > 0 and len(with_unit_indices) == 0:
-                    keep_addresses.extend(no_unit_indices)
-
-                # If only with-unit versions exist
-                elif len(no_unit_indices) == 0 and len(with_unit_indices) > 0:
-                    # Keep all unique unit versions
-                    keep_addresses.extend(with_unit_indices)
-
-        # For non-MDU: Check if there's a clear majority format and minority formats
-        # (MDU format checking already happened earlier)
-        if not is_mdu and len(format_counts) > 1:
-            total = len(all_formats)
-            majority_format = format_counts.most_common(1)[0][0]
-            majority_count = format_counts[majority_format]
-
-            # If majority is > 80%, flag minority formats
-            if majority_count / total > 0.8:
-                for idx, row in subname_df.iterrows():
-                    if idx not in keep_addresses and idx not in remove_addresses:
-                        row_format = self.get_unit_format_type(row['Unit Number'])
-                        if row_format != majority_format and row_format != 'no_unit':
-                            flagged.append({
-                                'index': idx,
-                                'reason': f'Minority unit format ({row_format}) vs majority ({majority_format})',
-                                **row.to_dict()
-                            })
-
-        # Check for one-off scenarios
-        total_in_subname = len(subname_df)
-        no_unit_count = len(subname_df[subname_df['Unit Number'].isna()])
-        with_unit_count = total_in_subname - no_unit_count
-
-        # Scenario: 149 with units, 1 without (or vice versa)
-        if total_in_subname > 10:  # Only flag if substantial sample size
-            if no_unit_count == 1 and with_unit_count > 10:
-                # The single no-unit is likely office/clubhouse
-                single_idx = subname_df[subname_df['Unit Number'].isna()].index[0]
-                if single_idx in keep_addresses:
-                    keep_addresses.remove(single_idx)
-                remove_addresses.append(single_idx)
-                flagged.append({
-                    'index': single_idx,
-                    'reason': f'One-off: Single address without unit among {with_unit_count} with units',
-                    **subname_df.loc[single_idx].to_dict()
-                })
-            elif with_unit_count == 1 and no_unit_count > 10:
-                # The single with-unit is likely office
-                single_idx = subname_df[~subname_df['Unit Number'].isna()].index[0]
-                if single_idx in keep_addresses:
-                    keep_addresses.remove(single_idx)
-                remove_addresses.append(single_idx)
-                flagged.append({
-                    'index': single_idx,
-                    'reason': f'One-off: Single address with unit among {no_unit_count} without units',
-                    **subname_df.loc[single_idx].to_dict()
-                })
-
-        return keep_addresses, remove_addresses, flagged
+        keep, remove, flagged, notes = process_roe_subname(subname_df, subname, building_type)
+        for note in notes:
+            print(f"    Note: {note}")
+        return keep, remove, flagged
 
     def process_roe_deduplication(self, roe_candidates):
         """Process ROE candidates with deduplication logic."""
@@ -470,11 +646,10 @@ class AddressSorter:
         remove_indices = []
 
         # Group by Subname AND Building Type (to handle "No Subname" properly)
-        grouped = roe_candidates.groupby(['Subname', 'Building Type'])
+        grouped = roe_candidates.groupby(['Subname', 'Building Type'], observed=True)
 
+        groups = []
         for (subname, building_type), subname_df in grouped:
-            print(f"\n  Processing: {subname} ({building_type}) - {len(subname_df)} addresses")
-
             # For "No Subname", sort by Street Name to group related addresses together
             if subname == 'No Subname':
                 if 'Street Name' in subname_df.columns:
@@ -482,8 +657,20 @@ class AddressSorter:
                 else:
                     # Extract street name from Street Address if column doesn't exist
                     subname_df = subname_df.sort_values('Street Address')
+            groups.append((subname_df, subname, building_type))
+
+        # Subnames are independent: process them in parallel (large inputs only),
+        # then merge in group order
+        parallel = len(roe_candidates) >= PARALLEL_ROW_THRESHOLD and len(groups) > 1
+        results = Parallel(n_jobs=self.n_jobs if parallel else 1, backend='loky')(
+            delayed(process_roe_subname)(subname_df, subname, building_type)
+            for subname_df, subname, building_type in groups
+        )
 
-            keep, remove, flagged = self.process_roe_subname(subname_df, subname, building_type)
+        for (subname_df, subname, building_type), (keep, remove, flagged, notes) in zip(groups, results):
+            print(f"\n  Processing: {subname} ({building_type}) - {len(subname_df)} addresses")
+            for note in notes:
+                print(f"    Note: {note}")
 
             keep_indices.extend(keep)
             remove_indices.extend(remove)
@@ -491,7 +678,7 @@ class AddressSorter:
 
             print(f"    Keeping: {len(keep)} addresses")
             print(f"    Removing: {len(remove)} addresses")
-            print(f"    Flagged: {len(flagged)} addresses")
+            print(f"    Flagged: {sum(len(f) for f in flagged)} addresses")
 
         # Create ROE and Remove tabs
         self.tabs['ROE'] = roe_candidates.loc[keep_indices].copy()
@@ -521,47 +708,44 @@ class AddressSorter:
         if self.tabs['ROE'] is None or len(self.tabs['ROE']) == 0:
             return
 
+        roe = self.tabs['ROE'].reset_index(drop=True)
+
         # Add Unit Count column if it doesn't exist
-        if 'Unit Count' not in self.tabs['ROE'].columns:
-            self.tabs['ROE'].insert(0, 'Unit Count', None)
-
-        # Calculate unit counts per subname
-        subname_counts = self.tabs['ROE']['Subname'].value_counts().to_dict()
-
-        # Create a new dataframe with spacing and unit counts
-        rows_with_spacing = []
-        prev_subname = None
-        first_in_community = True
-
-        for idx, row in self.tabs['ROE'].iterrows():
-            current_subname = row['Subname']
-
-            # Add blank row when subname changes (except for first entry)
-            if prev_subname is not None and current_subname != prev_subname:
-                # Create a blank row with NaN values
-                blank_row = {col: None for col in self.tabs['ROE'].columns}
-                rows_with_spacing.append(blank_row)
-                first_in_community = True
-
-            # Add unit count only on first row of each community
-            row_dict = row.to_dict()
-            if first_in_community and current_subname in subname_counts:
-                row_dict['Unit Count'] = subname_counts[current_subname]
-                first_in_community = False
-            else:
-                row_dict['Unit Count'] = None
-
-            rows_with_spacing.append(row_dict)
-            prev_subname = current_subname
+        if 'Unit Count' not in roe.columns:
+            roe.insert(0, 'Unit Count', None)
+
+        # First row of each community (ROE is already sorted by Subname)
+        subnames = roe['Subname']
+        first_in_community = subnames.ne(subnames.shift()).to_numpy()
+
+        # Unit count per subname, shown only on the first row of each community
+        subname_counts = roe.groupby('Subname', observed=True, sort=False)['Subname'].transform('size')
+        roe['Unit Count'] = subname_counts.where(first_in_community)
+
+        # A single community needs no spacing
+        n_communities = int(first_in_community.sum())
+        if n_communities <= 1:
+            self.tabs['ROE'] = roe
+            return
+
+        # Blank rows sit just before every community start except the first:
+        # shift each row down by the number of communities started before it,
+        # then reindex so the skipped positions become blank rows
+        positions = np.arange(len(roe)) + np.cumsum(first_in_community) - 1
 
         # Replace ROE tab with spaced version
-        self.tabs['ROE'] = pd.DataFrame(rows_with_spacing)
+        self.tabs['ROE'] = (
+            roe.astype(object)
+            .set_axis(positions)
+            .reindex(range(len(roe) + n_communities - 1))
+            .infer_objects()
+        )
 
     def create_flagged_tab(self):
         """Create the Flagged for Review tab."""
         if self.flagged_addresses:
-            self.tabs['Flagged for Review'] = pd.DataFrame(self.flagged_addresses)
-            print(f"\nCreated Flagged for Review tab with {len(self.flagged_addresses)} addresses")
+            self.tabs['Flagged for Review'] = pd.concat(self.flagged_addresses, ignore_index=True)
+            print(f"\nCreated Flagged for Review tab with {len(self.tabs['Flagged for Review'])} addresses")
         else:
             # Create empty dataframe with same columns
             self.tabs['Flagged for Review'] = pd.DataFrame(columns=list(self.df.columns) + ['reason'])
@@ -589,7 +773,7 @@ class AddressSorter:
         counts['Count'].append(len(self.tabs['Commercial']))
 
         # ROE by type
-        roe_by_type = self.tabs['ROE'].groupby('Building Type').size()
+        roe_by_type = self.tabs['ROE'].groupby('Building Type', observed=True).size()
         for building_type, count in roe_by_type.items():
             counts['Category'].append(f'ROE - {building_type}')
             counts['Count'].append(count)
@@ -616,28 +800,34 @@ class AddressSorter:
         for cat, cnt in zip(counts['Category'], counts['Count']):
             print(f"  {cat}: {cnt}")
 
+    def _market_rows(self, counts, zone):
+        """Helper: New Market summary rows built column-wise from community counts.
+
+        `counts` has one row per community with Subname, Building Type and
+        Listed Count columns; `zone` fills the Zone column (scalar or per row).
+        """
+        subnames = counts['Subname'].astype(object)
+        return pd.DataFrame({
+            'Zone': zone,
+            'Community': subnames.where(subnames != 'No Subname', ''),
+            'Type': counts['Building Type'],
+            'Listed Count': counts['Listed Count'],
+            'Vetro': '',
+            'Footage': '',
+            'Arterial footage': '',
+        })
+
     def _build_market_rows(self, zone_df, zone_label):
         """Helper: build summary rows for a group of ROE addresses.
 
         Rows are sorted by Type first, then Community name, so the same
         building types always appear together (all HOAs, then all SFAs, etc.).
         """
-        rows = []
-        for (subname, building_type), group in zone_df.groupby(
-            ['Subname', 'Building Type'], sort=True
-        ):
-            community_name = '' if subname == 'No Subname' else subname
-            rows.append({
-                'Zone': zone_label,
-                'Community': community_name,
-                'Type': building_type,
-                'Listed Count': len(group),
-                'Vetro': '',
-                'Footage': '',
-                'Arterial footage': '',
-            })
+        counts = zone_df.groupby(
+            ['Subname', 'Building Type'], sort=True, observed=True
+        ).size().reset_index(name='Listed Count')
         # Sort by Type first so same building types line up, then by Community
-        df = pd.DataFrame(rows)
+        df = self._market_rows(counts, zone_label)
         if not df.empty:
             df = df.sort_values(['Type', 'Community'], ignore_index=True)
         return df
@@ -671,21 +861,10 @@ class AddressSorter:
         # zones remain as separate rows.
         all_df = roe_data.copy()
         all_df['_zone_key'] = all_df['Zone'].fillna('') if 'Zone' in all_df.columns else ''
-        combined_rows = []
-        for (subname, zone_key, building_type), group in all_df.groupby(
-            ['Subname', '_zone_key', 'Building Type'], sort=True
-        ):
-            community_name = '' if subname == 'No Subname' else subname
-            combined_rows.append({
-                'Zone': zone_key,
-                'Community': community_name,
-                'Type': building_type,
-                'Listed Count': len(group),
-                'Vetro': '',
-                'Footage': '',
-                'Arterial footage': '',
-            })
-        combined_df = pd.DataFrame(combined_rows)
+        counts = all_df.groupby(
+            ['Subname', '_zone_key', 'Building Type'], sort=True, observed=True
+        ).size().reset_index(name='Listed Count')
+        combined_df = self._market_rows(counts, counts['_zone_key'])
         if not combined_df.empty:
             combined_df = combined_df.sort_values(
                 ['Zone', 'Type', 'Community'], ignore_index=True
@@ -716,17 +895,29 @@ class AddressSorter:
         """Save all tabs to an Excel file."""
         print(f"\nSaving output to {output_file}...")
 
-        with pd.ExcelWriter(output_file, engine='openpyxl') as writer:
-            for tab_name, df in self.tabs.items():
-                if df is not None and not df.empty:
-                    df.to_excel(writer, sheet_name=tab_name, index=False)
-                    print(f"  Saved {tab_name} tab ({len(df)} rows)")
-
-            # New Market Zone tabs (one per zone)
-            for tab_name, df in self.new_market_tabs.items():
+        # Core tabs followed by New Market Zone tabs (one per zone)
+        sheets = {**self.tabs, **self.new_market_tabs}
+        write_workbook(output_file, sheets)
+        for tab_name, df in sheets.items():
+            if df is not None and not df.empty:
+                print(f"  Saved {tab_name} tab ({len(df)} rows)")
+
+        # Large runs: also write Parquet so downstream tools can skip Excel
+        if len(self.df) > PARQUET_ROW_THRESHOLD:
+            parquet_dir = os.path.splitext(output_file)[0] + '_parquet'
+            os.makedirs(parquet_dir, exist_ok=True)
+            for tab_name, df in sheets.items():
                 if df is not None and not df.empty:
-                    df.to_excel(writer, sheet_name=tab_name, index=False)
-                    print(f"  Saved {tab_name} tab ({len(df)} rows)")
+                    # Object columns can mix numbers and text (e.g. Zip "75001" and
+                    # "75001-1234", or blanks filled with ''); store them as strings
+                    object_cols = df.columns[df.dtypes == object]
+                    df = df.astype({col: 'string' for col in object_cols})
+                    try:
+                        df.to_parquet(os.path.join(parquet_dir, f'{tab_name}.parquet'), index=False)
+                    except (ImportError, TypeError, ValueError) as e:
+                        # The Parquet copy is optional: the workbook is already saved
+                        print(f"  Warning: could not write Parquet copy of {tab_name} tab: {e}")
+            print(f"  Saved Parquet copies to {parquet_dir}")
 
         print(f"\n✓ Successfully saved to {output_file}")
 
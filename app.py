@@ -5,7 +5,52 @@ import tempfile
 import pandas as pd
 import streamlit as st
 
-from address_sorter import AddressSorter
+from address_sorter import AddressSorter, write_workbook
+
+# Cached results are shared by all sessions in the server process: keep only a
+# few recent uploads, for an hour, so memory stays bounded
+CACHE_MAX_ENTRIES = 4
+CACHE_TTL_SECONDS = 3600
+
+
+@st.cache_data(show_spinner=False, max_entries=CACHE_MAX_ENTRIES, ttl=CACHE_TTL_SECONDS)
+def run_sorter(file_bytes: bytes, suffix: str):
+	"""Run the sorter pipeline on an uploaded file's bytes.
+
+	Cached on the file content, so reruns from widget interactions (tab clicks,
+	downloads) reuse the results instead of reprocessing. Returns
+	(tabs, new_market_tabs).
+	"""
+	# Persist uploaded file to a temp path for AddressSorter (expects a path)
+	with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as tmp:
+		tmp.write(file_bytes)
+		input_path = tmp.name
+
+	try:
+		sorter = AddressSorter(input_path)
+		sorter.load_data()
+		roe_candidates = sorter.initial_sort()
+		sorter.process_roe_deduplication(roe_candidates)
+		sorter.create_flagged_tab()
+		sorter.create_unit_count_tab()
+		sorter.create_new_market_tabs()
+	finally:
+		# Clean up temp file
+		try:
+			os.unlink(input_path)
+		except Exception:
+			pass
+
+	return sorter.tabs, sorter.new_market_tabs
+
+
+@st.cache_data(show_spinner=False, max_entries=CACHE_MAX_ENTRIES, ttl=CACHE_TTL_SECONDS)
+def build_workbook(file_bytes: bytes, suffix: str) -> bytes:
+	"""Sorted Excel workbook for an uploaded file, cached like run_sorter."""
+	tabs, new_market_tabs = run_sorter(file_bytes, suffix)
+	buffer = io.BytesIO()
+	write_workbook(buffer, {**tabs, **new_market_tabs})
+	return buffer.getvalue()
 
 
 st.set_page_config(page_title="Address Sorter", layout="wide")
@@ -20,23 +65,19 @@ with st.sidebar:
     st.header("2) Actions")
     process_clicked = st.button("Process Addresses", type="primary", disabled=not uploaded)
 
+# Keep showing results for the processed file across reruns (cached, so cheap)
+upload_key = (uploaded.name, uploaded.size) if uploaded else None
 if uploaded and process_clicked:
-	# Persist uploaded file to a temp path for AddressSorter (expects a path)
+	st.session_state["processed_upload"] = upload_key
+
+if uploaded and st.session_state.get("processed_upload") == upload_key:
 	suffix = ".xlsx" if uploaded.name.lower().endswith(".xlsx") else ".csv"
-	with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as tmp:
-		tmp.write(uploaded.getvalue())
-		input_path = tmp.name
+	file_bytes = uploaded.getvalue()
 
 	# Run the sorter pipeline
 	try:
 		with st.spinner("Processing... This can take a moment for large files."):
-			sorter = AddressSorter(input_path)
-			sorter.load_data()
-			roe_candidates = sorter.initial_sort()
-			sorter.process_roe_deduplication(roe_candidates)
-			sorter.create_flagged_tab()
-			sorter.create_unit_count_tab()
-			sorter.create_new_market_tabs()
+			tabs, new_market_tabs = run_sorter(file_bytes, suffix)
 	except ValueError as ve:
 		st.error(f"Input error: {ve}")
 		st.stop()
@@ -45,28 +86,22 @@ if uploaded and process_clicked:
 		st.exception(e)
 		st.stop()
 
-	# Clean up temp file
-	try:
-		os.unlink(input_path)
-	except Exception:
-		pass
-
 	# Summary metrics
 	col1, col2, col3, col4 = st.columns(4)
 	with col1:
-		st.metric("Total", len(sorter.tabs.get("All", pd.DataFrame())))
+		st.metric("Total", len(tabs.get("All", pd.DataFrame())))
 	with col2:
-		st.metric("ROE", len(sorter.tabs.get("ROE", pd.DataFrame())))
+		st.metric("ROE", len(tabs.get("ROE", pd.DataFrame())))
 	with col3:
-		st.metric("Remove", len(sorter.tabs.get("Remove", pd.DataFrame())))
+		st.metric("Remove", len(tabs.get("Remove", pd.DataFrame())))
 	with col4:
-		flagged_df = sorter.tabs.get("Flagged for Review", pd.DataFrame())
+		flagged_df = tabs.get("Flagged for Review", pd.DataFrame())
 		st.metric("Flagged", len(flagged_df))
 
 	st.markdown("---")
 
 	# Tabbed preview of results — core tabs + New Market Zone tabs
-	all_preview = {**sorter.tabs, **sorter.new_market_tabs}
+	all_preview = {**tabs, **new_market_tabs}
 	sheet_names = list(all_preview.keys())
 	st.subheader("Preview Sheets")
 	tab_objects = st.tabs(sheet_names)
@@ -79,20 +114,10 @@ if uploaded and process_clicked:
 				st.dataframe(df, use_container_width=True, hide_index=True)
 
 	# Provide a download of the Excel workbook
-	buffer = io.BytesIO()
-	with pd.ExcelWriter(buffer, engine="openpyxl") as writer:
-		for tab_name, df in sorter.tabs.items():
-			if df is not None and not df.empty:
-				df.to_excel(writer, sheet_name=tab_name, index=False)
-		for tab_name, df in sorter.new_market_tabs.items():
-			if df is not None and not df.empty:
-				df.to_excel(writer, sheet_name=tab_name, index=False)
-	buffer.seek(0)
-
 	default_output_name = os.path.splitext(uploaded.name)[0] + "_sorted.xlsx"
 	st.download_button(
 		label="Download Sorted Excel",
-		data=buffer,
+		data=build_workbook(file_bytes, suffix),
 		file_name=default_output_name,
 		mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
 		type="primary",